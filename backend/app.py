@@ -3,6 +3,11 @@ Fresh minimal backend (EasyOCR, no Tesseract, no Docker).
 Place this file in backend/ next to requirements.txt and run-win.bat.
 
 Serves UI from ../frontend (so your index.html, css, and JS remain unchanged).
+Run locally with `python app.py`, or in production from backend/ with:
+  gunicorn -c gunicorn.conf.py
+EasyOCR downloads its models (~100 MB) into ~/.EasyOCR/model on first start;
+gunicorn fetches them once before forking workers (see on_starting in gunicorn.conf.py).
+
 Endpoint:
   POST /api/verify  -> multipart form with key 'file' (image or PDF)
   GET  /            -> serves frontend/index.html
@@ -10,29 +15,124 @@ Endpoint:
 """
 
 import os
-import io
+import re
+import gc
+import sys
+import random
+import signal
 import hashlib
+import tempfile
+import threading
 import traceback
-from flask import Flask, request, jsonify, send_file, send_from_directory, abort
-from PIL import Image, ImageOps
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import Flask, request, jsonify, send_from_directory
+from werkzeug.exceptions import NotFound
+from PIL import Image
 import numpy as np
+import cv2
 
 # Optional libs (if installed). We handle their absence gracefully.
 try:
     import easyocr
+    import torch
     EASYOCR_OK = True
-    # Create global reader once to avoid reloading models per request
-    reader = easyocr.Reader(["en"], gpu=False)
 except Exception:
     EASYOCR_OK = False
-    reader = None
 
 try:
-    from pdf2image import convert_from_bytes
+    import openvino as ov
+    OPENVINO_OK = True
+except Exception:
+    OPENVINO_OK = False
+
+try:
+    from pdf2image import convert_from_path
     PDF2IMAGE_OK = True
 except Exception:
     PDF2IMAGE_OK = False
 
+try:
+    import gevent
+    from gevent import monkey as gevent_monkey
+    GEVENT_OK = True
+except Exception:
+    GEVENT_OK = False
+
+try:
+    import orjson
+    ORJSON_OK = True
+except Exception:
+    ORJSON_OK = False
+
+try:
+    from flask_compress import Compress
+    COMPRESS_OK = True
+except Exception:
+    COMPRESS_OK = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_OK = True
+except Exception:
+    AHOCORASICK_OK = False
+
+# The EasyOCR/PyTorch model is not reentrant; serialize inference across threads/greenlets.
+# Under gevent this is a cooperative lock: waiting requests yield to the hub, and the
+# inference itself runs on a native thread (see run_inference), so static files, uploads
+# and the worker heartbeat keep being served while a page is OCR'd.
+OCR_LOCK = threading.Lock()
+
+# "openvino" (default when installed) compiles EasyOCR's models for Intel CPUs/GPUs; "torch" keeps PyTorch
+OCR_BACKEND = os.environ.get("OCR_BACKEND", "openvino" if OPENVINO_OK else "torch").lower()
+OPENVINO_DEVICE = os.environ.get("OPENVINO_DEVICE", "AUTO")
+# torch.compile the recognizer on the PyTorch backend (torch >= 2.1); opt-in with OCR_TORCH_COMPILE=1
+OCR_TORCH_COMPILE = os.environ.get("OCR_TORCH_COMPILE", "0") == "1"
+# PyTorch backend weights: "int8" (dynamic-quantized Linear/LSTM layers) or "fp32"
+OCR_QUANT = os.environ.get("OCR_QUANT", "int8").lower()
+
+# Warm the OCR models at process boot; set OCR_WARMUP=0 to skip (e.g. when importing in tests)
+OCR_WARMUP = os.environ.get("OCR_WARMUP", "1") == "1"
+
+# Recognition crops per forward pass; larger batches amortize per-call overhead
+OCR_BATCH_SIZE = 16
+# Pages per readtext_batched call. CRAFT runs over all of them as one stacked tensor
+# (~0.5 GB of activations per 150 dpi page), so this bounds peak memory per request.
+OCR_PAGES_PER_BATCH = 4
+
+# Worker processes that OCR PDF pages in parallel, each with its own reader.
+# 0 (default) keeps OCR in the web process; os.cpu_count() // 2 is a good start when enabling.
+OCR_WORKERS = int(os.environ.get("OCR_WORKERS", "0"))
+# Pages a worker handles before it is replaced, bounding EasyOCR's memory growth (Python 3.11+)
+OCR_WORKER_MAX_TASKS = int(os.environ.get("OCR_WORKER_MAX_TASKS", "200"))
+
+# OCR'd uploads a gunicorn worker handles before asking to be replaced, since EasyOCR's
+# memory creeps up per call (cache hits and static files don't count). Jittered by up to
+# 25% so workers don't all reload their models at once. 0 = never; gunicorn.conf.py sets
+# it, so `python app.py` never stops itself.
+OCR_MAX_CALLS = int(os.environ.get("OCR_MAX_CALLS", "0"))
+_ocr_call_limit = OCR_MAX_CALLS + random.randint(0, OCR_MAX_CALLS // 4) if OCR_MAX_CALLS > 0 else 0
+_ocr_calls = 0
+
+# Verify responses keyed by SHA-256 of the upload, so re-uploads skip OCR entirely
+OCR_CACHE_MAX_ENTRIES = 256
+OCR_CACHE: "OrderedDict[str, dict]" = OrderedDict()
+OCR_CACHE_LOCK = threading.Lock()
+
+# 2 MB reads keep each chunk cache-resident while it is hashed
+HASH_CHUNK_SIZE = 1 << 21
+
+# Every PDF starts with these bytes; the upload's content, not its name, decides the type
+PDF_MAGIC = b"%PDF"
+
+# PDF rasterization resolution. 150 dpi (down from 200) gives ~44% fewer pixels to
+# render and OCR, trading some accuracy on small print for speed: Letter/A4 pages at
+# 150 dpi are already above preprocess_for_ocr's min_dim, so nothing gets upscaled back,
+# and pages are exchanged as lossy JPEG. Raise OCR_PDF_DPI (200-300) for fine print.
+PDF_DPI = int(os.environ.get("OCR_PDF_DPI", "150"))
+
 BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
 FRONTEND_DIR = os.path.normpath(os.path.join(BACKEND_DIR, "..", "frontend"))
 
@@ -46,31 +146,84 @@ app = Flask(
     template_folder=FRONTEND_DIR,
 )
 
-def sha256_bytes(b: bytes) -> str:
-    import hashlib
-    return hashlib.sha256(b).hexdigest()
+# gzip/brotli for OCR payloads (full_text can be megabytes) and the frontend's text assets
+if COMPRESS_OK:
+    app.config["COMPRESS_MIMETYPES"] = ["application/json", "text/html", "text/css", "application/javascript"]
+    Compress(app)
 
-def pil_from_bytes(b: bytes):
-    """Open bytes as a PIL RGB image."""
-    return Image.open(io.BytesIO(b)).convert("RGB")
+def json_response(payload: dict, status: int = 200):
+    """Serialize with orjson (C, straight to bytes) when available, else Flask's jsonify."""
+    if ORJSON_OK:
+        return app.response_class(orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY), status=status, mimetype="application/json")
+    return jsonify(payload), status
 
-def preprocess_for_ocr(pil_img, min_dim=1200):
-    """Basic preprocessing: grayscale, autocontrast, upscale small images for better OCR."""
-    img = pil_img.convert("L")
-    w, h = img.size
+def spool_upload(stream, chunk_size=HASH_CHUNK_SIZE):
+    """
+    Copy an upload stream to a temporary file in chunks, hashing as we go, so the
+    upload is never held in memory as a whole. The caller must delete the file.
+    The temp name carries no extension from the user's filename: pdf2image and PIL
+    sniff the content, and a user-supplied suffix could exceed the name length limit.
+    Returns (path, sha256_hexdigest, head) where head is the first 4 bytes, for type sniffing.
+    """
+    h = hashlib.sha256()
+    head = b""
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            if not head:
+                head = chunk[:4]
+            h.update(chunk)
+            tmp.write(chunk)
+    return tmp.name, h.hexdigest(), head
+
+def cache_get(file_hash: str):
+    """Return a cached verify payload (marking it most recently used), or None."""
+    with OCR_CACHE_LOCK:
+        payload = OCR_CACHE.get(file_hash)
+        if payload is not None:
+            OCR_CACHE.move_to_end(file_hash)
+        return payload
+
+def cache_put(file_hash: str, payload: dict):
+    """Store a verify payload, evicting the least recently used entry past the cap."""
+    with OCR_CACHE_LOCK:
+        OCR_CACHE[file_hash] = payload
+        OCR_CACHE.move_to_end(file_hash)
+        while len(OCR_CACHE) > OCR_CACHE_MAX_ENTRIES:
+            OCR_CACHE.popitem(last=False)
+
+def gray_from_path(path: str):
+    """Decode an image file straight to a grayscale uint8 array (OCR never needs color)."""
+    with Image.open(path) as img:
+        # JPEGs decode only the luma channel instead of building RGB first
+        img.draft("L", img.size)
+        return np.asarray(img.convert("L"))
+
+def preprocess_for_ocr(img, min_dim=1200):
+    """
+    Basic preprocessing: grayscale, autocontrast, upscale small images for better OCR.
+    Accepts a grayscale uint8 array or a PIL image. Done with OpenCV on a single
+    uint8 array; returns that array (EasyOCR takes it as-is).
+    """
+    if isinstance(img, np.ndarray):
+        arr = img
+    else:
+        arr = np.asarray(img if img.mode == "L" else img.convert("L"))
+    h, w = arr.shape
     # Upscale small images
     if max(w, h) < min_dim:
         scale = int(min_dim / max(w, h)) + 1
-        img = img.resize((w * scale, h * scale), Image.BICUBIC)
-    img = ImageOps.autocontrast(img)
-    return img
+        arr = cv2.resize(arr, (w * scale, h * scale), interpolation=cv2.INTER_CUBIC)
+    # Stretch to the full 0-255 range (same as ImageOps.autocontrast); flat images stay as-is
+    lo, hi, _, _ = cv2.minMaxLoc(arr)
+    if hi > lo:
+        arr = cv2.normalize(arr, None, 0, 255, cv2.NORM_MINMAX)
+    return arr
 
-def ocr_easyocr_pil(pil_img):
-    """Run EasyOCR on a PIL image. Returns (text, avg_confidence, raw_results)."""
-    if not EASYOCR_OK or reader is None:
-        raise RuntimeError("EasyOCR not installed or failed to initialize.")
-    arr = np.array(pil_img.convert("RGB"))
-    results = reader.readtext(arr, detail=1)  # list of (bbox, text, conf)
+def summarize_ocr_results(results):
+    """Collapse EasyOCR (bbox, text, conf) results into (text, avg_confidence)."""
     texts = []
     confs = []
     for r in results:
@@ -80,13 +233,300 @@ def ocr_easyocr_pil(pil_img):
             confs.append(r[2])
     full_text = "\n".join(texts)
     avg_conf = (sum(confs) / len(confs)) if confs else None
-    return full_text, avg_conf, results
+    return full_text, avg_conf
+
+def count_ocr_call():
+    """Count an OCR'd upload; past the limit, ask gunicorn to replace this worker."""
+    global _ocr_calls
+    if _ocr_call_limit <= 0:
+        return
+    _ocr_calls += 1
+    if _ocr_calls == _ocr_call_limit:
+        app.logger.info("worker %s reached %s OCR calls, recycling", os.getpid(), _ocr_calls)
+        # SIGTERM is gunicorn's graceful stop: in-flight requests finish, then the arbiter forks a fresh worker
+        os.kill(os.getpid(), signal.SIGTERM)
+
+def release_ocr_memory():
+    """
+    Reclaim what EasyOCR leaves behind after a call (some versions grow RSS by tens
+    of MB per readtext): collect reference cycles and drop cached CUDA blocks.
+    Gunicorn's max_requests recycles workers for whatever still leaks.
+    """
+    gc.collect()
+    if EASYOCR_OK and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+def run_inference(fn, *args, **kwargs):
+    """
+    Call a CPU-bound model function. In a gevent-patched process it runs on the hub's
+    native thread pool, since C-level inference never yields and would otherwise stall
+    every other greenlet in the worker; elsewhere it is called directly.
+    """
+    if GEVENT_OK and gevent_monkey.is_module_patched("threading"):
+        return gevent.get_hub().threadpool.apply(fn, args, kwargs)
+    return fn(*args, **kwargs)
+
+def ocr_easyocr_array(arr):
+    """
+    Run EasyOCR on a preprocessed (grayscale) image array, passed through unchanged.
+    Returns (text, avg_confidence).
+    """
+    reader = get_reader()
+    try:
+        with OCR_LOCK:
+            results = run_inference(reader.readtext, arr, detail=1, batch_size=OCR_BATCH_SIZE)  # list of (bbox, text, conf)
+        full_text, avg_conf = summarize_ocr_results(results)
+        # drop the per-box results (bboxes, crops' metadata) before collecting
+        del results
+        return full_text, avg_conf
+    finally:
+        release_ocr_memory()
+
+def ocr_easyocr_pages(imgs):
+    """
+    Run EasyOCR over several preprocessed pages, OCR_PAGES_PER_BATCH at a time.
+    Each group of same-sized pages (the usual case for PDFs) goes through one
+    readtext_batched call; otherwise, or if batching fails, its pages are read one by one.
+    Returns a list of (text, avg_confidence) per page; failed pages yield None.
+    """
+    reader = get_reader()
+    arrs = [np.asarray(p) for p in imgs]
+    out = []
+    try:
+        for start in range(0, len(arrs), OCR_PAGES_PER_BATCH):
+            group = arrs[start:start + OCR_PAGES_PER_BATCH]
+            if len({a.shape for a in group}) == 1:
+                try:
+                    with OCR_LOCK:
+                        batched = run_inference(reader.readtext_batched, group, detail=1, batch_size=OCR_BATCH_SIZE)
+                    out.extend(summarize_ocr_results(r) for r in batched)
+                    continue
+                except Exception:
+                    pass
+            for arr in group:
+                try:
+                    with OCR_LOCK:
+                        results = run_inference(reader.readtext, arr, detail=1, batch_size=OCR_BATCH_SIZE)
+                    out.append(summarize_ocr_results(results))
+                except Exception:
+                    out.append(None)
+        return out
+    finally:
+        release_ocr_memory()
+
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
 
-def convert_pdf_bytes_to_pil_list(pdf_bytes, dpi=200):
-    """Use pdf2image to convert PDF to list of PIL images (requires poppler)."""
+def _init_ocr_worker():
+    """Pool initializer: split the cores between workers, then load this worker's reader."""
+    if EASYOCR_OK:
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // OCR_WORKERS))
+        warm_up()
+
+def get_ocr_pool():
+    """
+    Start the OCR process pool on first use. Never at import time: spawned workers
+    import this module too.
+    """
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            kwargs = {}
+            if sys.version_info >= (3, 11):
+                kwargs["max_tasks_per_child"] = OCR_WORKER_MAX_TASKS
+            _ocr_pool = ProcessPoolExecutor(
+                max_workers=OCR_WORKERS,
+                # spawn, not fork: forking a process that already holds torch threads can deadlock
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_ocr_worker,
+                **kwargs,
+            )
+        return _ocr_pool
+
+def start_ocr_pool():
+    """
+    Start the pool and its processes at boot so the first multi-page PDF doesn't pay
+    every child's model load. Doesn't wait: children load in the background.
+    """
+    pool = get_ocr_pool()
+    # spawn-context pools only start processes on submit; one no-op per worker starts them all
+    for _ in range(OCR_WORKERS):
+        pool.submit(int)
+
+def ocr_pages_in_pool(imgs):
+    """
+    OCR pages on the process pool. A dead child (OOM kill, segfault) breaks the
+    executor for good, so on BrokenProcessPool drop it, letting the next call start
+    a fresh pool, and re-raise so this request's pages count as failed.
+    """
+    global _ocr_pool
+    pool = get_ocr_pool()
+    try:
+        return list(pool.map(ocr_page_worker, imgs))
+    except BrokenProcessPool:
+        app.logger.error("an OCR worker process died; restarting the OCR pool")
+        with _ocr_pool_lock:
+            if _ocr_pool is pool:
+                _ocr_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+
+def ocr_page_worker(img):
+    """Pool task: OCR one preprocessed page. Returns (text, avg_confidence), or None on failure."""
+    try:
+        return ocr_easyocr_array(img)
+    except Exception:
+        return None
+
+def warmup_image():
+    """A small page with some dark text, so both the detector and the recognizer run."""
+    img = np.full((64, 384), 255, dtype=np.uint8)
+    cv2.putText(img, "Certificate 2024", (8, 44), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 0, 2)
+    return img
+
+def warmup_reader(reader, runs=2):
+    """Run a couple of throwaway inferences so the first real request isn't slow."""
+    dummy = warmup_image()
+    for _ in range(runs):
+        try:
+            reader.readtext(dummy, detail=1)
+        except Exception:
+            break
+
+def warm_up():
+    """
+    Load the reader and run warmup inferences at process boot, moving model load,
+    kernel selection and allocator warmup off the first request. Skipped with OCR_WARMUP=0.
+    """
+    if not OCR_WARMUP:
+        return
+    try:
+        reader = get_reader()
+    except RuntimeError as e:
+        app.logger.error("OCR models failed to load, OCR is disabled in this process: %s", e.__cause__ or e)
+        return
+    # OpenVINO's AUTO device and compiled graphs' shape caches settle over a few more runs
+    warmup_reader(reader, runs=3 if OCR_BACKEND == "openvino" or OCR_TORCH_COMPILE else 2)
+    # pool children run warm_up too (via _init_ocr_worker); only the web process owns a pool
+    if OCR_WORKERS > 0 and multiprocessing.parent_process() is None:
+        start_ocr_pool()
+
+class OpenVINOModule:
+    """Stand-in for one of EasyOCR's torch modules that runs a compiled OpenVINO model instead."""
+
+    def __init__(self, compiled):
+        self.compiled = compiled
+
+    def eval(self):
+        return self
+
+    def __call__(self, x, *args):
+        res = self.compiled(x.detach().cpu().numpy())
+        # copy: output buffers belong to the infer request and are reused by the next call
+        outs = tuple(torch.from_numpy(res[o].copy()) for o in self.compiled.outputs)
+        return outs[0] if len(outs) == 1 else outs
+
+if EASYOCR_OK:
+    class _RecognizerExport(torch.nn.Module):
+        """EasyOCR's recognizer takes an unused `text` argument; hide it for conversion."""
+
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, x):
+            return self.model(x, None)
+
+def accelerate_with_openvino(r):
+    """Convert the reader's detector and recognizer to OpenVINO once and swap them in."""
+    core = ov.Core()
+    with torch.no_grad():
+        det = ov.convert_model(r.detector.eval(), example_input=torch.zeros(1, 3, 640, 640))
+        rec = ov.convert_model(_RecognizerExport(r.recognizer).eval(), example_input=torch.zeros(1, 1, 64, 256))
+    r.detector = OpenVINOModule(core.compile_model(det, device_name=OPENVINO_DEVICE))
+    r.recognizer = OpenVINOModule(core.compile_model(rec, device_name=OPENVINO_DEVICE))
+    return r
+
+def build_reader():
+    """Create the EasyOCR reader, running on OpenVINO when that backend is selected."""
+    if OCR_BACKEND == "openvino" and OPENVINO_OK:
+        try:
+            # convert from the FP32 models; OpenVINO picks its own inference precision
+            r = accelerate_with_openvino(easyocr.Reader(["en"], gpu=False, quantize=False))
+            # trial inference: output arity/order and input shapes through the OpenVINOModule
+            # shim only show up when EasyOCR actually runs; call the recognizer directly too
+            # in case detection finds no boxes on the trial image
+            r.readtext(warmup_image(), detail=1)
+            with torch.no_grad():
+                r.recognizer(torch.zeros(1, 1, 64, 256), None)
+            return r
+        except Exception as e:
+            app.logger.warning("OpenVINO backend failed to convert or run, falling back to PyTorch: %s", e)
+    # EasyOCR applies torch dynamic INT8 quantization itself when quantize=True on CPU
+    r = easyocr.Reader(["en"], gpu=False, quantize=(OCR_QUANT == "int8"))
+    if OCR_TORCH_COMPILE:
+        compile_recognizer(r)
+    return r
+
+def compile_recognizer(r):
+    """
+    Swap in a torch.compile'd recognizer, keeping the eager one if torch is too
+    old or the compiled module fails a trial call.
+    """
+    version = tuple(int(v) for v in torch.__version__.split("+")[0].split(".")[:2])
+    if version < (2, 1):
+        app.logger.warning("OCR_TORCH_COMPILE needs torch >= 2.1, found %s", torch.__version__)
+        return r
+    eager = r.recognizer
+    try:
+        # widths vary with line length, so compile for dynamic shapes
+        r.recognizer = torch.compile(eager, dynamic=True)
+        with torch.no_grad():
+            r.recognizer(torch.zeros(1, 1, 64, 256), None)
+    except Exception as e:
+        app.logger.warning("torch.compile of the recognizer failed, staying eager: %s", e)
+        r.recognizer = eager
+    return r
+
+_reader = None
+_reader_lock = threading.Lock()
+
+def get_reader():
+    """
+    Return the shared EasyOCR reader, building it on first use so processes that
+    only serve static files never load the models.
+    Raises RuntimeError if EasyOCR is missing or fails to initialize.
+    """
+    global _reader, EASYOCR_OK
+    if _reader is None:
+        with _reader_lock:
+            if _reader is None:
+                if not EASYOCR_OK:
+                    raise RuntimeError("EasyOCR not installed or failed to initialize.")
+                try:
+                    r = build_reader()
+                except Exception as e:
+                    EASYOCR_OK = False
+                    raise RuntimeError("EasyOCR not installed or failed to initialize.") from e
+                _reader = r
+    return _reader
+
+def convert_pdf_to_pil_list(pdf_path, dpi=PDF_DPI):
+    """
+    Use pdf2image to convert PDF to list of grayscale PIL images (requires poppler).
+    Pages are rasterized by several pdftocairo processes in parallel and
+    exchanged as JPEG, which is much smaller to write and decode than PPM.
+    """
     if not PDF2IMAGE_OK:
         raise RuntimeError("pdf2image is not installed. Install pdf2image and poppler to enable PDF uploads.")
-    return convert_from_bytes(pdf_bytes, dpi=dpi)
+    return convert_from_path(
+        pdf_path,
+        dpi=dpi,
+        thread_count=os.cpu_count() or 4,
+        fmt="jpeg",
+        use_pdftocairo=True,
+        grayscale=True,
+    )
 
 # Lightweight heuristics
 KNOWN_ISSUERS = [
@@ -94,14 +534,31 @@ KNOWN_ISSUERS = [
     "coursera", "edx", "udemy", "iit", "mit", "stanford", "google", "microsoft"
 ]
 
-def detect_issuer_in_text(text: str):
-    t = (text or "").lower()
-    found = set()
-    for kw in KNOWN_ISSUERS:
-        if kw in t:
-            found.add(kw)
+# One automaton matches every keyword in a single pass over the text
+if AHOCORASICK_OK:
+    ISSUER_AUTOMATON = ahocorasick.Automaton()
+    for _kw in KNOWN_ISSUERS:
+        ISSUER_AUTOMATON.add_word(_kw, _kw)
+    ISSUER_AUTOMATON.make_automaton()
+else:
+    ISSUER_AUTOMATON = None
+
+def detect_issuer_in_text(text: str, lower: str = None):
+    # callers that already lowercased the text pass it as `lower` to skip another copy
+    t = lower if lower is not None else (text or "").lower()
+    if ISSUER_AUTOMATON is not None:
+        found = {kw for _, kw in ISSUER_AUTOMATON.iter(t)}
+    else:
+        found = set()
+        for kw in KNOWN_ISSUERS:
+            if kw in t:
+                found.add(kw)
     return sorted(found)
 
+# 4-digit years (1900-2100) or common issue-date phrases, found in one C-level scan.
+# Matched against the lowercased text, so no IGNORECASE folding per character.
+DATE_RE = re.compile(r"\b(?:19\d{2}|20\d{2}|2100)\b|issued on|date of|on:")
+
 def quick_trust_score(word_count:int, issuer_count:int, has_dates:bool):
     score = 30
     if word_count > 50:
@@ -112,22 +569,25 @@ def quick_trust_score(word_count:int, issuer_count:int, has_dates:bool):
     return max(0, min(100, score))
 
 # ---- Routes to serve frontend files without changing UI ----
+# Let browsers cache static assets and revalidate with ETag/If-Modified-Since (304s).
+# In production, prefer serving frontend/ straight from nginx in front of gunicorn.
+STATIC_MAX_AGE = 3600
+
+def send_frontend_file(filename):
+    # send_from_directory rejects paths escaping FRONTEND_DIR and 404s on missing files
+    return send_from_directory(FRONTEND_DIR, filename, max_age=STATIC_MAX_AGE, conditional=True)
+
 @app.route("/", methods=["GET"])
 def serve_index():
-    index_path = os.path.join(FRONTEND_DIR, "index.html")
-    if os.path.exists(index_path):
-        return send_file(index_path)
-    return "index.html not found in frontend folder.", 404
+    try:
+        return send_frontend_file("index.html")
+    except NotFound:
+        return "index.html not found in frontend folder.", 404
 
 @app.route("/<path:filename>", methods=["GET"])
 def serve_frontend_file(filename):
-    # serve files from frontend folder (css, js, assets). Don't allow escaping base dir.
-    safe_path = os.path.normpath(os.path.join(FRONTEND_DIR, filename))
-    if not safe_path.startswith(os.path.abspath(FRONTEND_DIR)):
-        return abort(403)
-    if os.path.exists(safe_path):
-        return send_file(safe_path)
-    return abort(404)
+    # serve files from frontend folder (css, js, assets)
+    return send_frontend_file(filename)
 
 # ---- OCR API ----
 @app.route("/api/verify", methods=["POST"])
@@ -139,47 +599,71 @@ def api_verify():
       - full_text, snippet, word_count
       - detected_issuers, has_dates, avg_confidence, trust_score
     """
+    path = None
+    ocr_ran = False
     try:
         if "file" not in request.files:
             return jsonify({"error": "no file part named 'file' in request"}), 400
         f = request.files["file"]
         filename = f.filename or "upload"
-        raw = f.read()
-        file_hash = sha256_bytes(raw)
+        path, file_hash, head = spool_upload(f.stream)
+
+        cached = cache_get(file_hash)
+        if cached is not None:
+            return json_response(dict(cached, file_name=filename))
 
         texts = []
         confidences = []
         page_count = 0
+        word_count = 0
+        ocr_failed = False
 
-        is_pdf = filename.lower().endswith(".pdf") or raw[:4] == b"%PDF"
+        is_pdf = head == PDF_MAGIC
+        if is_pdf != (os.path.splitext(filename)[1].lower() == ".pdf"):
+            app.logger.warning("file extension of %r disagrees with its content (pdf=%s)", filename, is_pdf)
         if is_pdf:
             if not PDF2IMAGE_OK:
                 return jsonify({"error": "pdf_uploaded_but_pdf2image_missing", "message": "Install pdf2image and poppler to enable PDF support."}), 400
             try:
-                pages = convert_pdf_bytes_to_pil_list(raw, dpi=200)
+                pages = convert_pdf_to_pil_list(path)
             except Exception as e:
                 tb = traceback.format_exc()
                 return jsonify({"error": "pdf_conversion_failed", "details": str(e), "trace": tb}), 500
-            for p in pages:
-                page_count += 1
-                pre = preprocess_for_ocr(p)
-                try:
-                    txt, conf, meta = ocr_easyocr_pil(pre)
-                    texts.append(txt)
-                    if conf is not None:
-                        confidences.append(conf)
-                except Exception:
+            # preprocess every page up front, then hand EasyOCR the whole batch
+            pre_pages = [preprocess_for_ocr(p) for p in pages]
+            del pages  # the rasterized PIL pages aren't needed once preprocessed
+            page_count = len(pre_pages)
+            ocr_ran = True
+            try:
+                if OCR_WORKERS > 0 and page_count > 1:
+                    page_results = ocr_pages_in_pool(pre_pages)
+                else:
+                    page_results = ocr_easyocr_pages(pre_pages)
+            except Exception:
+                page_results = [None] * page_count
+            for res in page_results:
+                if res is None:
+                    # keep the page slot (and its separator) but don't cache a partial result
+                    ocr_failed = True
                     texts.append("")
+                    continue
+                txt, conf = res
+                texts.append(txt)
+                word_count += len(txt.split())
+                if conf is not None:
+                    confidences.append(conf)
         else:
             # image
             try:
-                pil = pil_from_bytes(raw)
+                gray = gray_from_path(path)
             except Exception as e:
                 return jsonify({"error": "cannot_read_image", "details": str(e)}), 400
-            pre = preprocess_for_ocr(pil)
+            pre = preprocess_for_ocr(gray)
+            ocr_ran = True
             try:
-                txt, conf, meta = ocr_easyocr_pil(pre)
+                txt, conf = ocr_easyocr_array(pre)
                 texts.append(txt)
+                word_count += len(txt.split())
                 if conf is not None:
                     confidences.append(conf)
                 page_count = 1
@@ -188,15 +672,16 @@ def api_verify():
                 return jsonify({"error": "ocr_failed", "details": str(e), "trace": tb}), 500
 
         full_text = "\n\n---PAGE---\n\n".join(texts).strip()
+        # the ---PAGE--- separators have always counted as words; keep the trust score stable
+        word_count += max(0, len(texts) - 1)
         snippet = (full_text[:1000] + "...") if len(full_text) > 1000 else full_text
-        words = [w for w in full_text.split() if w.strip()]
-        word_count = len(words)
-        issuers = detect_issuer_in_text(full_text)
-        has_dates = any(tok.isdigit() and (len(tok) == 4 and 1900 <= int(tok) <= 2100) for tok in words) or any(k in (full_text or "").lower() for k in ["issued on", "date of", "on:"])
-        avg_conf = (sum(confidences)/len(confidences)) if confidences else None
+        full_text_lower = full_text.lower()
+        issuers = detect_issuer_in_text(full_text, lower=full_text_lower)
+        has_dates = DATE_RE.search(full_text_lower) is not None
+        avg_conf = float(sum(confidences)/len(confidences)) if confidences else None
         trust = quick_trust_score(word_count, len(issuers), has_dates)
 
-        return jsonify({
+        payload = {
             "file_name": filename,
             "file_hash": file_hash,
             "page_count": page_count,
@@ -207,17 +692,31 @@ def api_verify():
             "has_dates": has_dates,
             "avg_ocr_confidence": avg_conf,
             "trust_score": trust
-        }), 200
+        }
+        if not ocr_failed:
+            cache_put(file_hash, payload)
+        return json_response(payload)
 
     except Exception as e:
         tb = traceback.format_exc()
         return jsonify({"error": "internal_server_error", "details": str(e), "trace": tb}), 500
+    finally:
+        if path is not None:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        if ocr_ran:
+            count_ocr_call()
 
 # ---- startup ----
 if __name__ == "__main__":
     print("Starting fresh EasyOCR backend (no Tesseract, no Docker).")
     print("Frontend served from:", FRONTEND_DIR)
     print("EasyOCR available:", EASYOCR_OK)
+    print("OCR backend:", OCR_BACKEND, "| PyTorch weights:", OCR_QUANT)
     print("pdf2image/poppler available:", PDF2IMAGE_OK)
-    # Debug True for local dev; set False for production
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    print("OCR worker processes:", OCR_WORKERS)
+    warm_up()
+    # Single-process dev server; use gunicorn (see gunicorn.conf.py) for concurrent clients
+    app.run(host="0.0.0.0", port=5000)
@@ -0,0 +1,57 @@
+"""
+Gunicorn settings for the EasyOCR backend.
+Run from the backend/ folder:
+  gunicorn -c gunicorn.conf.py
+
+gevent workers monkey-patch the stdlib (gunicorn calls gevent.monkey.patch_all()
+before loading the app), so socket I/O (uploads, responses) and waiting on the
+poppler subprocess used by pdf2image yield to other requests instead of blocking
+the worker. Plain file reads/writes are not cooperative and still block briefly. EasyOCR
+inference is CPU-bound C code that never yields, so app.run_inference hands it
+to gevent's native thread pool; the hub keeps serving meanwhile.
+"""
+
+import os
+import subprocess
+import sys
+
+wsgi_app = "app:app"
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+
+worker_class = "gevent"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+# worker_connections is left at gunicorn's default (1000): OCR is already serialized per
+# worker by app.OCR_LOCK, and a small cap would let a few keep-alive browser connections
+# or queued verify requests lock static GETs out of the worker.
+
+# The heartbeat keeps running during OCR (inference is off the hub), but it only starts
+# after post_worker_init: model load, OpenVINO conversion + trial run and 2-3 warmup
+# inferences all count against this, with every worker booting at once.
+timeout = 300
+
+# EasyOCR's memory use creeps up per call, so the app asks gunicorn to replace a worker
+# after ~200 OCR'd uploads (app.OCR_MAX_CALLS, jittered). gunicorn's own max_requests
+# isn't used: it counts every request, so static files (/, CSS, logo: several per page
+# view) would force a full model reload every few dozen page views.
+os.environ.setdefault("OCR_MAX_CALLS", "200")
+
+# No preload_app: building the reader runs torch (weight copies, quantization) and
+# OpenVINO compilation, neither of which is safe to do before fork. Each worker loads
+# its own models after fork instead, so keep `workers` within the RAM budget.
+
+
+def on_starting(server):
+    # EasyOCR downloads missing models (~100 MB, into ~/.EasyOCR/model) through a fixed
+    # temp.zip, so workers loading at the same time on first boot would race each other.
+    # Fetch them once here, in a child process so the master itself never imports torch.
+    code = "import easyocr; easyocr.Reader(['en'], gpu=False, quantize=False)"
+    try:
+        subprocess.run([sys.executable, "-c", code], check=True, timeout=600)
+    except Exception as e:
+        server.log.warning("Pre-fetching EasyOCR models failed (%s); workers will try on boot", e)
+
+
+def post_worker_init(worker):
+    # Load and warm this worker's OCR models before it takes requests
+    import app
+    app.warm_up()